@@ -10,14 +10,27 @@ Usage:
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
 import gspread
+from google.auth.exceptions import RefreshError
 from google.oauth2.service_account import Credentials
+from PIL import Image
+import concurrent.futures
+import io
+import logging
 import os
+import queue
+import random
+import threading
+import time
 from pathlib import Path
+from typing import NamedTuple
 
 APP_ROOT = Path(__file__).resolve().parent
 
+logger = logging.getLogger(__name__)
+
 
 # =============================================================================
 # CONFIGURATION - Edit these settings as needed
@@ -36,15 +49,47 @@ DATASET_B_CSV = APP_ROOT / "sampleb_900_pairs.csv"
 DATASET_A_IMAGES_DIR = APP_ROOT / "imagesa"
 DATASET_B_IMAGES_DIR = APP_ROOT / "imagesb"
 
+# Guidance images shown on the instructions page and in the sidebar
+GUIDE_MAIN_IMAGE = APP_ROOT / "types" / "image.jpeg"
+GUIDE_TYPE_IMAGES = [
+    ("Eyes", APP_ROOT / "types" / "eyes.jpg"),
+    ("Nose", APP_ROOT / "types" / "nose.jpg"),
+    ("Chin", APP_ROOT / "types" / "chin.jpg"),
+    ("Face shape", APP_ROOT / "types" / "face.jpg"),
+]
+GUIDE_IMAGE_WIDTH = 480  # px; wide enough for the sidebar and a half-width column of a 1000 px page
+
 ANNOTATORS_A = {"annotator1", "annotator2", "annotator3", "annotator4"}
 ANNOTATORS_B = {"annotator5", "annotator6", "annotator7", "annotator8"}
 
 TOTAL_A = 900  # used for offsetting B indices so pair_index is globally unique (900..1799)
 
+# Columns read from the pairs CSVs and their dtypes ("index" is optional)
+PAIRS_CSV_DTYPES = {
+    "index": np.int64,
+    "A": str,
+    "B": str,
+    "ground_truth": str,
+    "celeb_id": str,
+}
+
 # If using URLs for images (e.g., from a server), set this to True
 USE_IMAGE_URLS = False
 IMAGE_URL_BASE = "https://yourserver.com/images/"  # Base URL if using URLs
 
+# Pair images are shown at this width (px); thumbnails are pre-sized to match
+PAIR_IMAGE_WIDTH = 320
+PREFETCH_AHEAD = 3  # upcoming pairs whose thumbnails are warmed in the background
+
+# Shown while some of this session's annotations could not be written
+SAVE_FAILED_MESSAGE = (
+    "Some of your annotations could not be saved to Google Sheets. They will be "
+    "sent again with your next submission, or use Finish session to retry now."
+)
+
+# Session-state keys of the per-pair input widgets (reused for every pair)
+PAIR_INPUT_KEYS = ("decision", "explanation", "followup_reflect")
+
 # Validation settings
 MIN_NAME_LENGTH = 5
 MIN_EXPLANATION_LENGTH = 20
@@ -52,74 +97,380 @@ MIN_EXPLANATION_LENGTH = 20
 # Super user(s): review everything without explanations
 SUPER_USERS = {"venus"}
 
+# Annotations are written to Google Sheets by a background thread in batches
+WRITE_BATCH_SIZE = 20  # max rows per append_rows call
+WRITE_LINGER_SECONDS = 2.0  # how long the writer waits to fill a batch
+API_MAX_TRIES = 6  # attempts per Sheets call when rate limited (HTTP 429)
+
+# Header row of the annotations sheet (annotation_to_row follows this order)
+SHEET_HEADERS = [
+    "timestamp", "annotator_id", "pair_index", "image_a", "image_b",
+    "ground_truth", "celeb_id", "human_decision", "initial_explanation",
+    "is_correct", "followup_explanation"
+]
+
+# Sheets values.append options: store cells as-is (no formula/type parsing),
+# insert new rows, and anchor the table at A1 so the end of the data does not
+# have to be located by scanning the sheet.
+APPEND_OPTIONS = {
+    "value_input_option": "RAW",
+    "insert_data_option": "INSERT_ROWS",
+    "table_range": "A1",
+}
+
 
 # =============================================================================
 # GOOGLE SHEETS FUNCTIONS
 # =============================================================================
 
+def _load_credentials():
+    """
+    Load the service account credentials.
+
+    Tries CREDENTIALS_FILE first, then st.secrets["gcp_service_account"].
+    Returns None if neither is available.
+    """
+    scopes = [
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive"
+    ]
+
+    if os.path.exists(CREDENTIALS_FILE):
+        return Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=scopes)
+
+    try:
+        info = st.secrets.get("gcp_service_account")
+    except Exception:  # no secrets.toml at all
+        info = None
+    if info:
+        return Credentials.from_service_account_info(info, scopes=scopes)
+    return None
+
+
+@st.cache_resource
+def get_credentials():
+    """The service account credentials, loaded once per server process."""
+    return _load_credentials()
+
+
+def _open_sheet(creds):
+    """Open the annotations worksheet and make sure it has a header row. Raises on failure."""
+    client = gspread.authorize(creds)
+    sheet = client.open_by_key(SPREADSHEET_ID).sheet1
+
+    # Initialize headers if sheet is empty (only the first row is fetched).
+    # Written in place at A1 rather than appended, so two workers starting
+    # on an empty sheet at the same time cannot add two header rows.
+    if not _with_backoff(sheet.row_values, 1):
+        _with_backoff(
+            sheet.update,
+            range_name="A1",
+            values=[SHEET_HEADERS],
+            value_input_option="RAW",
+        )
+    return sheet
+
+
 @st.cache_resource
+def _open_google_sheet():
+    """
+    The worksheet handle, opened once per server process.
+
+    Failures raise instead of returning None: Streamlit does not cache an
+    exception, so the next call tries to connect again.
+    """
+    return _open_sheet(get_credentials())
+
+
 def get_google_sheet():
-    """Connect to Google Sheets."""
+    """Connect to Google Sheets (cached); None, with an error shown, if that fails."""
     try:
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-
-        # Try to load credentials from file or Streamlit secrets
-        if os.path.exists(CREDENTIALS_FILE):
-            creds = Credentials.from_service_account_file(CREDENTIALS_FILE, scopes=scopes)
-        elif hasattr(st, 'secrets') and 'gcp_service_account' in st.secrets:
-            creds = Credentials.from_service_account_info(
-                st.secrets["gcp_service_account"], scopes=scopes
-            )
-        else:
+        if get_credentials() is None:
             st.error("No credentials found. Please add credentials.json file.")
             return None
+        return _open_google_sheet()
+    except Exception as e:
+        st.error(f"Could not connect to Google Sheets: {e}")
+        return None
 
-        client = gspread.authorize(creds)
-        sheet = client.open_by_key(SPREADSHEET_ID).sheet1
 
-        # Initialize headers if sheet is empty
-        if not sheet.get_all_values():
-            headers = [
-                "timestamp", "annotator_id", "pair_index", "image_a", "image_b",
-                "ground_truth", "celeb_id", "human_decision", "initial_explanation",
-                "is_correct", "followup_explanation"
-            ]
-            sheet.append_row(headers)
+class PendingWrites:
+    """One session's rows in the background writer: in-flight count and failed rows."""
 
-        return sheet
-    except Exception as e:
-        st.error(f"Could not connect to Google Sheets: {e}")
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._failed = []
+
+    def sent(self):
+        with self._cond:
+            self._in_flight += 1
+
+    def done(self, annotation, ok):
+        """Called by the writer thread once a row was saved (ok) or given up on."""
+        with self._cond:
+            self._in_flight -= 1
+            if not ok:
+                self._failed.append(annotation)
+            self._cond.notify_all()
+
+    def wait(self):
+        """Block until the writer has reported on every row sent so far."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._in_flight == 0)
+
+    def failed_count(self) -> int:
+        with self._cond:
+            return len(self._failed)
+
+    def take_failed(self) -> list:
+        with self._cond:
+            failed, self._failed = self._failed, []
+        return failed
+
+
+def get_pending_writes() -> PendingWrites:
+    """This session's PendingWrites (created on first use)."""
+    if "pending_writes" not in st.session_state:
+        st.session_state.pending_writes = PendingWrites()
+    return st.session_state.pending_writes
+
+
+# Queued by a waiting flush to make the writer send its current batch now.
+# None rather than object(): every script rerun re-creates module globals,
+# and the writer thread must still recognise markers queued by later runs.
+FLUSH = None
+
+
+@st.cache_resource
+def get_writer_queue(_sheet):
+    """
+    Start the background Google Sheets writer (once per process) and return
+    its queue of (annotation, PendingWrites) items and FLUSH markers.
+    """
+    q = queue.Queue()
+    t = threading.Thread(target=_writer_loop, args=(_sheet, q), daemon=True)
+    t.start()
+    return q
+
+
+def _writer_loop(sheet, q):
+    """
+    Drain queued annotations in batches of up to WRITE_BATCH_SIZE and append
+    them to the sheet, reporting each row to the PendingWrites it came from.
+    """
+    while True:
+        item = q.get()
+        if item is FLUSH:
+            q.task_done()
+            continue
+        batch = [item]
+        # Give rows submitted shortly after the first one a chance to join it,
+        # unless a session is already waiting on them
+        deadline = time.monotonic() + WRITE_LINGER_SECONDS
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                item = q.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if item is FLUSH:
+                q.task_done()
+                break
+            batch.append(item)
+        ok = False
+        try:
+            rows = [annotation_to_row(a) for a, _ in batch]
+            try:
+                _with_backoff(sheet.append_rows, rows, **APPEND_OPTIONS)
+            except (gspread.exceptions.APIError, RefreshError) as e:
+                if not _is_auth_error(e):
+                    raise
+                # Credentials were rotated or revoked: reconnect once and retry
+                new_sheet = reconnect_google_sheet()
+                if new_sheet is None:
+                    raise
+                sheet = new_sheet
+                _with_backoff(sheet.append_rows, rows, **APPEND_OPTIONS)
+            ok = True
+            _completed_pairs_cached.clear()  # progress reads must see the new rows
+        except Exception:
+            # No Streamlit context in this thread: log it here, and the
+            # submitting sessions learn about it through their PendingWrites
+            logger.exception("Error saving %d annotation(s) to Google Sheets", len(batch))
+        finally:
+            for annotation, writes in batch:
+                writes.done(annotation, ok)
+                q.task_done()
+
+
+def _is_auth_error(error):
+    """
+    Whether an error means our credentials were rejected: a failed token
+    refresh (revoked or rotated key) or HTTP 401. A 403 is not included, since
+    it usually means the sheet is not shared with us and new credentials from
+    the same source would not help.
+    """
+    if isinstance(error, RefreshError):
+        return True
+    return error.response.status_code == 401
+
+
+def reconnect_google_sheet():
+    """
+    Open the worksheet again with freshly loaded credentials (e.g. after a key
+    rotation). Runs on the writer thread, so failures are logged, not shown.
+
+    The cached credentials and handle are only dropped once the new
+    connection works, so a failed attempt leaves them as they were. Returns
+    the new worksheet, or None on failure.
+    """
+    try:
+        creds = _load_credentials()
+        if creds is None:
+            raise RuntimeError("no credentials found")
+        sheet = _open_sheet(creds)
+    except Exception:
+        logger.exception("Could not reconnect to Google Sheets")
         return None
+    get_credentials.clear()
+    _open_google_sheet.clear()
+    return sheet
+
+
+def _retry_delay(error, attempt):
+    """Seconds to wait before retrying a rate-limited request."""
+    try:
+        retry_after = error.response.headers.get("Retry-After")
+        if retry_after:
+            return float(retry_after)
+        for detail in error.response.json()["error"].get("details", []):
+            if "retryDelay" in detail:
+                return float(str(detail["retryDelay"]).rstrip("s"))
+    except (ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return 2 ** attempt + random.random()
+
+
+def _with_backoff(fn, *args, max_tries=API_MAX_TRIES, **kwargs):
+    """
+    Call a gspread function, retrying while Google Sheets rate limits us (HTTP 429).
+
+    Waits for the server's Retry-After / retryDelay hint when present, otherwise
+    backs off exponentially with jitter. Other errors are raised immediately.
+    """
+    for attempt in range(max_tries):
+        try:
+            return fn(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if e.response.status_code != 429 or attempt == max_tries - 1:
+                raise
+            time.sleep(_retry_delay(e, attempt))
+
+
+def build_annotation(annotator_id, pair, decision, initial_explanation, followup_explanation=""):
+    """Build the annotation dict for a submitted pair (a PairRecord)."""
+    return {
+        "annotator_id": annotator_id,
+        "pair_index": pair.index,
+        "image_a": pair.A,
+        "image_b": pair.B,
+        "ground_truth": pair.ground_truth,
+        "celeb_id": pair.celeb_id,
+        "human_decision": decision,
+        "initial_explanation": initial_explanation,
+        "is_correct": decision == pair.ground_truth,
+        "followup_explanation": followup_explanation,
+    }
+
+
+def annotation_to_row(annotation_data):
+    """Turn a queued annotation into a sheet row (column order matches the headers)."""
+    timestamp = annotation_data.get("timestamp")
+    if not timestamp and "_enqueue_ns" in annotation_data:
+        # Local time of the submit, formatted here on the writer thread
+        timestamp = datetime.fromtimestamp(annotation_data["_enqueue_ns"] / 1e9).isoformat()
+    return [
+        timestamp or "",
+        annotation_data.get("annotator_id", ""),
+        annotation_data.get("pair_index", ""),
+        annotation_data.get("image_a", ""),
+        annotation_data.get("image_b", ""),
+        annotation_data.get("ground_truth", ""),
+        annotation_data.get("celeb_id", ""),
+        annotation_data.get("human_decision", ""),
+        annotation_data.get("initial_explanation", ""),
+        annotation_data.get("is_correct", ""),
+        annotation_data.get("followup_explanation", "")
+    ]
 
 
 def save_annotation(sheet, annotation_data):
-    """Save a single annotation to Google Sheets."""
+    """
+    Queue a single annotation for Google Sheets.
+
+    The annotation is handed to the background writer thread, so submitting
+    never waits on the Sheets API. Only the submit time is recorded here; the
+    writer formats the timestamp and builds the row when it drains the queue.
+    """
     if sheet is None:
         st.error("Cannot save annotation: Google Sheets is not available.")
         return False
 
-    try:
-        row = [
-            annotation_data.get("timestamp", ""),
-            annotation_data.get("annotator_id", ""),
-            annotation_data.get("pair_index", ""),
-            annotation_data.get("image_a", ""),
-            annotation_data.get("image_b", ""),
-            annotation_data.get("ground_truth", ""),
-            annotation_data.get("celeb_id", ""),
-            annotation_data.get("human_decision", ""),
-            annotation_data.get("initial_explanation", ""),
-            annotation_data.get("is_correct", ""),
-            annotation_data.get("followup_explanation", "")
-        ]
-        sheet.append_row(row)
-        return True
-    except Exception as e:
-        st.error(f"Error saving annotation: {e}")
-        return False
+    # Rows of this session that failed earlier get another try with this one
+    _resend_failed(sheet)
+    _enqueue(sheet, {**annotation_data, "_enqueue_ns": time.time_ns()})
+    return True
+
+
+def _enqueue(sheet, annotation):
+    """Hand one annotation to the writer, tracked in this session's PendingWrites."""
+    writes = get_pending_writes()
+    writes.sent()
+    get_writer_queue(sheet).put((annotation, writes))
+
+
+def _resend_failed(sheet):
+    """Queue this session's previously failed rows again (they keep their submit time)."""
+    for annotation in get_pending_writes().take_failed():
+        _enqueue(sheet, annotation)
+
+
+def flush_annotations(sheet) -> bool:
+    """
+    Retry this session's failed rows and block until the writer has reported
+    on all of its rows. Returns True if nothing is left unsaved.
+    """
+    writes = get_pending_writes()
+    if sheet is not None:
+        _resend_failed(sheet)
+        get_writer_queue(sheet).put(FLUSH)
+    with st.spinner("Saving annotations..."):
+        writes.wait()
+    return writes.failed_count() == 0
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _completed_pairs_cached(_sheet, spreadsheet_id, annotator_id):
+    """
+    Pair indices completed by annotator_id, cached per (spreadsheet, annotator)
+    for 30 s.
+
+    The worksheet is underscore-prefixed so Streamlit does not try to hash it;
+    spreadsheet_id stands in for it in the cache key.
+    Errors propagate (and are therefore not cached). The writer thread clears
+    this cache after every successful write.
+    """
+    # Only fetch the annotator_id (B) and pair_index (C) columns, column-major
+    # so the response is two flat lists rather than one list per row
+    columns = _with_backoff(_sheet.get, "B2:C", major_dimension="COLUMNS")
+    if len(columns) < 2:
+        return []
+    annotators, pair_indices = columns[0], columns[1]
+    return [
+        int(pair)
+        for annotator, pair in zip(annotators, pair_indices)
+        if annotator == annotator_id and pair.isdigit()
+    ]
 
 
 def get_completed_pairs(sheet, annotator_id):
@@ -127,15 +478,7 @@ def get_completed_pairs(sheet, annotator_id):
     if sheet is None or not annotator_id:
         return []
     try:
-        records = sheet.get_all_records()
-        completed = []
-        for r in records:
-            if r.get("annotator_id") == annotator_id:
-                try:
-                    completed.append(int(r["pair_index"]))
-                except (ValueError, TypeError, KeyError):
-                    continue
-        return completed
+        return _completed_pairs_cached(sheet, SPREADSHEET_ID, annotator_id)
     except Exception:
         return []
 
@@ -164,11 +507,55 @@ def resolve_dataset_for_user(annotator_id: str) -> str:
     return "ALL"
 
 
-@st.cache_data
-def load_pairs(dataset_key: str):
+def get_pairs_version() -> tuple:
+    """Modification times of the pairs CSVs; part of every pairs cache key."""
+    return tuple(
+        p.stat().st_mtime if p.exists() else None
+        for p in (DATASET_A_CSV, DATASET_B_CSV)
+    )
+
+
+def _read_pairs_csv(csv_path, split: str, offset: int = 0) -> pd.DataFrame:
+    """
+    Read one pairs CSV and normalise it once, so per-pair code needs no casts:
+    int64 index (offset applied), str celeb_id ("" when blank), lowercased
+    ground_truth (NaN when blank, see load_pairs), plus the derived
+    dataset/A_lower/B_lower columns.
+    """
+    # Typed read of the known columns only: no dtype inference pass, and any
+    # extra columns in the CSV are never materialised
+    df = pd.read_csv(
+        csv_path,
+        usecols=lambda c: c in PAIRS_CSV_DTYPES,
+        dtype=PAIRS_CSV_DTYPES,
+        engine="c",
+    )
+    df["split"] = split
+    if "index" not in df.columns:
+        df.insert(0, "index", range(len(df)))
+    df["index"] = df["index"].astype(np.int64) + offset
+    df["ground_truth"] = df["ground_truth"].str.lower()
+    # A blank celeb_id reads as NaN even with dtype=str; NaN is not valid JSON
+    # for the Sheets API, so normalise it to an empty string
+    df["celeb_id"] = df["celeb_id"].fillna("") if "celeb_id" in df.columns else ""
+    # Derived columns for the super-review filters: source dataset and
+    # lowercased filenames for case-insensitive search
+    df["dataset"] = infer_dataset_prefixes(df["A"])
+    df["A_lower"] = df["A"].str.lower()
+    df["B_lower"] = df["B"].str.lower()
+    return df
+
+
+@st.cache_resource
+def load_pairs(dataset_key: str, pairs_version: tuple = ()):
     """
     Load image pairs depending on dataset_key in {"A","B","ALL"}.
 
+    Cached with st.cache_resource: the pairs CSVs are read-only reference data,
+    so every rerun shares one DataFrame instead of hashing/copying it. Callers
+    must not mutate the returned DataFrame in place. Pass get_pairs_version()
+    so edits to the CSVs invalidate the cache.
+
     IMPORTANT:
     - Group A indices are 0..899
     - Group B indices are offset to 900..1799 (TOTAL_A offset)
@@ -176,38 +563,26 @@ def load_pairs(dataset_key: str):
     """
     try:
         if dataset_key == "A":
-            df = pd.read_csv(DATASET_A_CSV)
-            df = df.copy()
-            df["split"] = "A"
-            if "index" not in df.columns:
-                df.insert(0, "index", range(len(df)))
-            df["index"] = df["index"].astype(int)
-            return df
-
-        if dataset_key == "B":
-            df = pd.read_csv(DATASET_B_CSV)
-            df = df.copy()
-            df["split"] = "B"
-            if "index" not in df.columns:
-                df.insert(0, "index", range(len(df)))
-            df["index"] = df["index"].astype(int) + TOTAL_A
-            return df
-
-        # ALL: concatenate A then B, offset B indices by len(A)
-        df_a = pd.read_csv(DATASET_A_CSV).copy()
-        df_a["split"] = "A"
-        if "index" not in df_a.columns:
-            df_a.insert(0, "index", range(len(df_a)))
-        df_a["index"] = df_a["index"].astype(int)
-
-        df_b = pd.read_csv(DATASET_B_CSV).copy()
-        df_b["split"] = "B"
-        if "index" not in df_b.columns:
-            df_b.insert(0, "index", range(len(df_b)))
-        df_b["index"] = df_b["index"].astype(int) + len(df_a)
-
-        df = pd.concat([df_a, df_b], ignore_index=True)
-        df["index"] = df["index"].astype(int)
+            df = _read_pairs_csv(DATASET_A_CSV, "A")
+        elif dataset_key == "B":
+            df = _read_pairs_csv(DATASET_B_CSV, "B", offset=TOTAL_A)
+        else:
+            # ALL: concatenate A then B, offset B indices by len(A)
+            df_a = _read_pairs_csv(DATASET_A_CSV, "A")
+            df_b = _read_pairs_csv(DATASET_B_CSV, "B", offset=len(df_a))
+            df = pd.concat([df_a, df_b], ignore_index=True)
+
+        # A pair without a ground_truth label can never be scored, so it is
+        # left out (after the index offsets, so other indices do not shift)
+        missing_gt = df["ground_truth"].isna()
+        if missing_gt.any():
+            st.warning(f"Skipped {int(missing_gt.sum())} pair(s) with no ground_truth in the pairs CSV(s).")
+            df = df[~missing_gt].reset_index(drop=True)
+
+        # Low-cardinality filter columns as categoricals (after the concat,
+        # which would fall back to object dtype for differing categories)
+        for col in ("dataset", "ground_truth"):
+            df[col] = df[col].astype("category")
         return df
 
     except Exception as e:
@@ -215,6 +590,51 @@ def load_pairs(dataset_key: str):
         return None
 
 
+class PairRecord(NamedTuple):
+    """One pair from the pairs CSV, as plain Python values."""
+    index: int
+    A: str
+    B: str
+    ground_truth: str  # lowercased
+    celeb_id: str
+    split: str
+
+
+class PairsAssets(NamedTuple):
+    """Lookup structures derived once from a dataset's pairs (see load_pairs_assets)."""
+    idx_list: list  # pair indices in CSV order
+    records: dict  # pair index -> PairRecord (O(1) lookup per rerun)
+    positions: dict  # pair index -> position in idx_list (slot in the progress bitmap)
+    min_idx: int  # smallest / largest pair index (bounds of the super-review jump input)
+    max_idx: int
+
+
+@st.cache_resource
+def load_pairs_assets(dataset_key: str, pairs_version: tuple = ()) -> PairsAssets:
+    """Build the PairsAssets for the given dataset once per pairs version."""
+    pairs_df = load_pairs(dataset_key, pairs_version)
+    if pairs_df is None:
+        return PairsAssets([], {}, {}, 0, 0)
+    # load_pairs already normalised the dtypes; to_dict gives plain Python values
+    idx_list = pairs_df["index"].tolist()
+    records = {
+        r["index"]: PairRecord(
+            index=r["index"],
+            A=r["A"],
+            B=r["B"],
+            ground_truth=r["ground_truth"],
+            celeb_id=r["celeb_id"],
+            split=r["split"],
+        )
+        for r in pairs_df.to_dict("records")
+    }
+    positions = {i: pos for pos, i in enumerate(idx_list)}
+    return PairsAssets(
+        idx_list, records, positions,
+        min(idx_list, default=0), max(idx_list, default=0),
+    )
+
+
 def get_image_path(filename, split: str = "A"):
     """Get the full path or URL for an image (routes to imagesa/imagesb locally)."""
     if USE_IMAGE_URLS:
@@ -225,35 +645,154 @@ def get_image_path(filename, split: str = "A"):
     return str(base / str(filename))
 
 
-def infer_dataset_prefix(filename: str) -> str:
-    """Infer dataset name from filename prefix (best-effort)."""
-    if not isinstance(filename, str):
-        return "unknown"
-    if filename.startswith("celeba_"):
-        return "celeba"
-    if filename.startswith("casia_"):
-        return "casia"
-    if filename.startswith("vggface2_"):
-        return "vggface2"
-    if filename.startswith("lfw_"):
-        return "lfw"
-    return "other"
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_thumb(path: str, w: int = PAIR_IMAGE_WIDTH) -> bytes:
+    """
+    Decode a local image once and shrink it to fit w x w pixels (JPEG bytes).
 
+    The pair images are always displayed at a fixed width, so sending a
+    pre-sized thumbnail avoids shipping the full-resolution file on every rerun.
+    JPEG and PNG files that already fit are returned as-is: re-encoding them
+    would only lose quality and usually make them larger.
+    """
+    with Image.open(path) as im:
+        if max(im.size) <= w and im.format in ("JPEG", "PNG"):
+            return Path(path).read_bytes()
+        im = im.convert("RGB")
+        im.thumbnail((w, w), Image.Resampling.LANCZOS)
+        buf = io.BytesIO()
+        im.save(buf, format="JPEG", quality=85)
+    return buf.getvalue()
+
+
+def image_source(path: str, width: int):
+    """What to pass to st.image: URLs as-is, local files as cached thumbnails."""
+    if USE_IMAGE_URLS:
+        return path
+    return load_thumb(path, width)
 
-# =============================================================================
-# UI COMPONENTS
-# =============================================================================
 
-def render_sidebar_guidance():
+@st.cache_resource
+def get_prefetch_pool():
+    """Thread pool used to warm the thumbnail cache for upcoming pairs."""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+
+def prefetch_upcoming_pairs(completed, current_pos, records, all_pairs):
     """
-    Sidebar guidance: prompts + full-width images (no thumbnails/expanders).
-    Uses the same assets as the instructions page.
+    Decode the thumbnails of the next PREFETCH_AHEAD unannotated pairs after
+    position current_pos in the background while the annotator works on the
+    current one. load_thumb is cached, so the next pair then renders straight
+    from the cache.
     """
-    st.markdown("#### Guidance")
-    st.caption("Prefer stable structure over appearance.")
+    if USE_IMAGE_URLS:
+        return  # URLs are fetched by the browser, nothing to warm here
+    # Walk forward and stop after PREFETCH_AHEAD pending pairs, so a rerun
+    # never scans the rest of the bitmap
+    upcoming = []
+    pos = current_pos + 1
+    while pos < len(completed) and len(upcoming) < PREFETCH_AHEAD:
+        if not completed[pos]:
+            upcoming.append(all_pairs[pos])
+        pos += 1
+    # Reruns within the same pair would only resubmit the same work
+    if st.session_state.get("prefetched_pairs") == upcoming:
+        return
+    st.session_state.prefetched_pairs = upcoming
 
-    st.markdown(
-        """
+    pool = get_prefetch_pool()
+    for pair_index in upcoming:
+        rec = records[pair_index]
+        for filename in (rec.A, rec.B):
+            pool.submit(load_thumb, get_image_path(filename, split=rec.split), PAIR_IMAGE_WIDTH)
+
+
+# Filename prefix (text before the first underscore) -> dataset name
+DATASET_PREFIXES = {
+    "celeba": "celeba",
+    "casia": "casia",
+    "vggface2": "vggface2",
+    "lfw": "lfw",
+}
+
+
+def infer_dataset_prefixes(filenames: pd.Series) -> pd.Series:
+    """
+    Infer the dataset name of each filename from its prefix (best-effort).
+
+    Vectorised: one regex pass for the text before the first underscore and a
+    dict lookup, giving "other" for unknown prefixes and "unknown" for
+    missing filenames.
+    """
+    prefixes = filenames.str.extract(r"^([^_]*)_", expand=False)
+    datasets = prefixes.map(DATASET_PREFIXES).fillna("other")
+    return datasets.mask(filenames.isna(), "unknown")
+
+
+# =============================================================================
+# INSTRUCTION TEXT
+# =============================================================================
+# Static markdown for the instructions page and the sidebar guide, built once
+# at import instead of on every rerun.
+
+INTRO_MD = """
+# Face Identity Annotation Task
+
+Decide if two face photos show the **Same person** or **Different people**, then write **1–3 sentences** explaining *which facial evidence* supports your choice.
+"""
+
+WORKFLOW_MD = """
+### Workflow (fast checklist)
+1. Compare both faces (side-by-side).
+2. Choose **Same** or **Different**.
+3. Justify using **specific facial parts** (not vague impressions).
+4. If feedback disagrees, reflect on what you missed.
+"""
+
+KEY_RULE_MD = """
+### Key rule
+Prefer **stable structure** over changeable appearance.
+
+**Structure (good evidence):** face shape, jawline, cheekbones, eye spacing, nose/lip shape, ears  
+**Appearance (weak evidence):** hair, makeup, lighting, expression, camera angle, image quality
+"""
+
+USE_GUIDE_MD = """
+### Use this guide while comparing
+When deciding, actively check **multiple** regions shown in the diagram:
+
+- **Eyes & brows:** spacing, brow shape, eyelid fold, lash line
+- **Nose:** bridge width, tip shape, nostril shape
+- **Mouth & lips:** lip thickness, cupid’s bow, mouth corners
+- **Face structure:** jawline, chin shape, cheekbone prominence
+- **Ears (high value):** outer rim shape, earlobe attachment
+
+Aim to cite **2–4 concrete cues** in your explanation.
+"""
+
+VISUAL_REFERENCES_CAPTION = (
+    "While comparing a pair, you may cross-check these example feature types (eyes, nose, chin, face shape). "
+    "They are intended to help you describe *specific* differences or matches, especially in subtle cases where the persons may appear to be doppelgangers. "
+    "Use this as a reference, not a strict comparison guide."
+)
+
+EXAMPLE_SAME_MD = """
+### Example — Same person (strong)
+> “Same person. The eye spacing and brow shape match closely, and the nose bridge width with the nostril shape is consistent. Despite lighting differences, the jawline contour and chin shape align.”
+"""
+
+EXAMPLE_DIFF_MD = """
+### Example — Different people (strong)
+> “Different people. The nose tip and nostril shape differ (one is narrower with a sharper tip), and the eye spacing is noticeably wider in the second image. The jawline is more angular in the first face, while the second has a rounder chin and fuller cheeks.”
+"""
+
+TIPS_MD = """
+- If one image is low quality or angled, **downweight** surface details and rely more on **global structure** (jaw/chin/cheekbones).
+- Don’t over-trust hairline, beard, makeup, or expression.
+- If uncertain, explain what conflicts (e.g., “eyes match but jawline differs”).
+"""
+
+SIDEBAR_GUIDANCE_MD = """
 **If SAME:** identify *what* matches (2–4 cues). Don't just say 'eyes look similar'. Emphasize on what characteristic of eyes makes them same.
 - Eye spacing / eyelid fold / brow shape  
 - Nose bridge/tip/nostrils  
@@ -265,130 +804,161 @@ def render_sidebar_guidance():
 - Eye spacing / brow geometry  
 - Jaw/chin geometry, cheek fullness (structure, not expression)  
 - Ear rim / lobe attachment
-        """
-    )
+"""
+
+
+# =============================================================================
+# UI COMPONENTS
+# =============================================================================
+
+def render_sidebar_guidance():
+    """
+    Sidebar guidance: prompts + full-width images (no thumbnails/expanders).
+    Uses the same assets as the instructions page.
+    """
+    st.markdown("#### Guidance")
+    st.caption("Prefer stable structure over appearance.")
+
+    st.markdown(SIDEBAR_GUIDANCE_MD)
 
     st.divider()
     st.markdown("#### Visual guides")
 
     # Main diagram reference (render full width of sidebar)
-    main_ref = APP_ROOT / "types" / "image.jpeg"
+    main_ref = GUIDE_MAIN_IMAGE
     if main_ref.exists():
-        st.image(str(main_ref), caption="Facial regions reference", use_container_width=True)
+        st.image(load_thumb(str(main_ref), GUIDE_IMAGE_WIDTH), caption="Facial regions reference", use_container_width=True)
     else:
         st.warning("Missing: types/image.jpeg")
 
     # Feature-type references (render full width as well)
-    types_paths = [
-        ("Eyes", APP_ROOT / "types" / "eyes.jpg"),
-        ("Nose", APP_ROOT / "types" / "nose.jpg"),
-        ("Chin", APP_ROOT / "types" / "chin.jpg"),
-        ("Face shape", APP_ROOT / "types" / "face.jpg"),
-    ]
+    types_paths = GUIDE_TYPE_IMAGES
 
     for label, p in types_paths:
         if p.exists():
-            st.image(str(p), caption=label, use_container_width=True)
+            st.image(load_thumb(str(p), GUIDE_IMAGE_WIDTH), caption=label, use_container_width=True)
         else:
             st.caption(f"Missing: {p}")
 
 
-def ensure_local_progress_initialized(sheet, pairs_df):
+def ensure_local_progress_initialized():
     """
-    Ensure st.session_state.completed_local exists and is initialized from
-    Google Sheets for the current annotator (hybrid model).
+    Ensure st.session_state.completed_local is a progress bitmap for the
+    current annotator and dataset.
+
+    completed_local is a NumPy bool array aligned with the dataset's idx_list
+    (completed_local[pos] is True once idx_list[pos] is annotated). It is
+    seeded from the pair indices read from Google Sheets once at login
+    (st.session_state.completed_seed, see show_instructions) and afterwards
+    only updated locally via mark_completed, so reruns never hit the Sheets
+    API. Indices that are not part of the dataset are dropped when the bitmap
+    is built, the first time it is used with that dataset.
     """
-    annotator_id = st.session_state.annotator_id
-    if "completed_local" not in st.session_state:
-        if annotator_id and sheet is not None:
-            from_sheet = get_completed_pairs(sheet, annotator_id)
-            st.session_state.completed_local = set(from_sheet)
-        else:
-            st.session_state.completed_local = set()
+    dataset = (st.session_state.get("dataset_key", "ALL"), get_pairs_version())
+    if (
+        "completed_local" in st.session_state
+        and st.session_state.get("completed_local_dataset") == dataset
+    ):
+        return
 
-    # Optionally enforce only valid indices (important when switching A/B/ALL)
-    valid_indices = set(pairs_df["index"].tolist())
-    st.session_state.completed_local = {
-        i for i in st.session_state.completed_local if i in valid_indices
-    }
+    seed = set(st.session_state.pop("completed_seed", ()))
+    # Carry over progress made against a previous version of the pairs
+    if "completed_local" in st.session_state and st.session_state.get("completed_local_dataset"):
+        old_assets = load_pairs_assets(*st.session_state.completed_local_dataset)
+        bitmap = st.session_state.completed_local
+        if len(old_assets.idx_list) == len(bitmap):
+            seed.update(old_assets.idx_list[pos] for pos in np.flatnonzero(bitmap))
 
+    assets = load_pairs_assets(*dataset)
+    completed = np.zeros(len(assets.idx_list), dtype=bool)
+    completed[[assets.positions[i] for i in seed if i in assets.positions]] = True
+    st.session_state.completed_local = completed
+    st.session_state.completed_local_dataset = dataset
+    st.session_state.pending_cursor = 0
 
-def show_instructions(pairs_df, sheet):
-    """Display the instructions page."""
 
-    st.markdown("""
-# Face Identity Annotation Task
+def _progress_assets() -> PairsAssets:
+    """The PairsAssets that st.session_state.completed_local is aligned with."""
+    return load_pairs_assets(*st.session_state.completed_local_dataset)
+
+
+def next_pending_position():
+    """
+    Position in idx_list of the first pair not yet completed, or None if all are.
+
+    Pairs are completed in order, so st.session_state.pending_cursor only ever
+    moves forward: each rerun scans from where the previous one stopped
+    instead of from the start. Anything that clears bits in completed_local
+    must reset the cursor to 0 (rebuilding the bitmap does).
+    """
+    completed = st.session_state.completed_local
+    cursor = st.session_state.get("pending_cursor", 0)
+    while cursor < len(completed) and completed[cursor]:
+        cursor += 1
+    st.session_state.pending_cursor = cursor
+    return cursor if cursor < len(completed) else None
+
+
+def mark_completed(pair_index: int):
+    """Record a completed pair in the progress bitmap."""
+    pos = _progress_assets().positions.get(pair_index)
+    if pos is not None:
+        st.session_state.completed_local[pos] = True
+
+
+def clear_pair_inputs():
+    """Reset the per-pair widgets (they use fixed keys) before moving to another pair."""
+    for key in PAIR_INPUT_KEYS:
+        st.session_state.pop(key, None)
+
+
+def num_completed_pairs() -> int:
+    """Number of pairs the current annotator has completed in this dataset."""
+    return int(np.count_nonzero(st.session_state.completed_local))
 
-Decide if two face photos show the **Same person** or **Different people**, then write **1–3 sentences** explaining *which facial evidence* supports your choice.
-""")
+
+def show_instructions(pairs_df, get_sheet):
+    """Display the instructions page."""
+    sheet = get_sheet()
+    if sheet is None:
+        st.warning("Running without Google Sheets. Annotations will not be saved.")
+
+    st.markdown(INTRO_MD)
 
     # Compact workflow + key rule
     c1, c2 = st.columns([1.1, 1.2], gap="large")
 
     with c1:
-        st.markdown("""
-### Workflow (fast checklist)
-1. Compare both faces (side-by-side).
-2. Choose **Same** or **Different**.
-3. Justify using **specific facial parts** (not vague impressions).
-4. If feedback disagrees, reflect on what you missed.
-""")
+        st.markdown(WORKFLOW_MD)
 
     with c2:
-        st.markdown("""
-### Key rule
-Prefer **stable structure** over changeable appearance.
-
-**Structure (good evidence):** face shape, jawline, cheekbones, eye spacing, nose/lip shape, ears  
-**Appearance (weak evidence):** hair, makeup, lighting, expression, camera angle, image quality
-""")
+        st.markdown(KEY_RULE_MD)
 
     st.markdown("---")
 
     # Image + context, compact side-by-side
-    img_path = APP_ROOT / "types" / "image.jpeg"
+    img_path = GUIDE_MAIN_IMAGE
     ic1, ic2 = st.columns([1, 1.2], gap="large")
 
     with ic1:
         if img_path.exists():
-            st.image(str(img_path), use_container_width=True)
+            st.image(load_thumb(str(img_path), GUIDE_IMAGE_WIDTH), use_container_width=True)
             st.caption("Reference: facial regions that often carry identity signal.")
         else:
             st.error("Instruction image `types/image.jpeg` not found in app directory.")
 
     with ic2:
-        st.markdown("""
-### Use this guide while comparing
-When deciding, actively check **multiple** regions shown in the diagram:
-
-- **Eyes & brows:** spacing, brow shape, eyelid fold, lash line
-- **Nose:** bridge width, tip shape, nostril shape
-- **Mouth & lips:** lip thickness, cupid’s bow, mouth corners
-- **Face structure:** jawline, chin shape, cheekbone prominence
-- **Ears (high value):** outer rim shape, earlobe attachment
-
-Aim to cite **2–4 concrete cues** in your explanation.
-""")
+        st.markdown(USE_GUIDE_MD)
 
     st.markdown("### Visual references")
-    st.caption(
-        "While comparing a pair, you may cross-check these example feature types (eyes, nose, chin, face shape). "
-        "They are intended to help you describe *specific* differences or matches, especially in subtle cases where the persons may appear to be doppelgangers. "
-        "Use this as a reference, not a strict comparison guide."
-    )
-
-    types_paths = [
-        ("Eyes", APP_ROOT / "types" / "eyes.jpg"),
-        ("Nose", APP_ROOT / "types" / "nose.jpg"),
-        ("Chin", APP_ROOT / "types" / "chin.jpg"),
-        ("Face shape", APP_ROOT / "types" / "face.jpg"),
-    ]
+    st.caption(VISUAL_REFERENCES_CAPTION)
 
+    # Downscaled to the column width: the originals are up to 1440 px tall
     cols = st.columns(2, gap="medium")
-    for i, (label, p) in enumerate(types_paths):
+    for i, (label, p) in enumerate(GUIDE_TYPE_IMAGES):
         with cols[i % 2]:
             if p.exists():
-                st.image(str(p), caption=label, use_container_width=True)
+                st.image(load_thumb(str(p), GUIDE_IMAGE_WIDTH), caption=label, use_container_width=True)
             else:
                 st.warning(f"Missing: {p}")
 
@@ -397,35 +967,25 @@ Aim to cite **2–4 concrete cues** in your explanation.
     # Examples: Same vs Different
     e1, e2 = st.columns(2, gap="large")
     with e1:
-        st.markdown("""
-### Example — Same person (strong)
-> “Same person. The eye spacing and brow shape match closely, and the nose bridge width with the nostril shape is consistent. Despite lighting differences, the jawline contour and chin shape align.”
-""")
+        st.markdown(EXAMPLE_SAME_MD)
     with e2:
-        st.markdown("""
-### Example — Different people (strong)
-> “Different people. The nose tip and nostril shape differ (one is narrower with a sharper tip), and the eye spacing is noticeably wider in the second image. The jawline is more angular in the first face, while the second has a rounder chin and fuller cheeks.”
-""")
+        st.markdown(EXAMPLE_DIFF_MD)
 
     with st.expander("Optional tips for tricky cases"):
-        st.markdown("""
-- If one image is low quality or angled, **downweight** surface details and rely more on **global structure** (jaw/chin/cheekbones).
-- Don’t over-trust hairline, beard, makeup, or expression.
-- If uncertain, explain what conflicts (e.g., “eyes match but jawline differs”).
-""")
+        st.markdown(TIPS_MD)
 
     st.divider()
 
     # If we already have an annotator, show their progress
     if st.session_state.annotator_id:
-        ensure_local_progress_initialized(sheet, pairs_df)
-        completed = st.session_state.completed_local
+        ensure_local_progress_initialized()
+        num_completed = num_completed_pairs()
         total = len(pairs_df)
 
         st.info(f"Welcome back, **{st.session_state.annotator_id}**!")
-        progress = len(completed) / total if total > 0 else 0
+        progress = num_completed / total if total > 0 else 0
         st.progress(progress)
-        st.caption(f"Your progress: {len(completed)} / {total} pairs completed")
+        st.caption(f"Your progress: {num_completed} / {total} pairs completed")
 
         if st.button("Continue", type="primary"):
             st.session_state.show_instructions = False
@@ -441,100 +1001,96 @@ Aim to cite **2–4 concrete cues** in your explanation.
         key="annotator_input"
     )
 
-    name_valid = len(annotator_id.strip()) >= MIN_NAME_LENGTH
+    stripped_name = annotator_id.strip()
+    name_len = len(stripped_name)
+    name_valid = name_len >= MIN_NAME_LENGTH
 
     if annotator_id:
         if not name_valid:
             st.warning(
                 f"Please enter at least {MIN_NAME_LENGTH} characters "
-                f"({len(annotator_id.strip())}/{MIN_NAME_LENGTH})"
+                f"({name_len}/{MIN_NAME_LENGTH})"
             )
         else:
-            st.success(f"Name valid ({len(annotator_id.strip())} characters)")
+            st.success(f"Name valid ({name_len} characters)")
 
     if st.button("I understand, continue", type="primary"):
         if not name_valid:
             st.error(f"Your name/ID must be at least {MIN_NAME_LENGTH} characters.")
         else:
-            st.session_state.annotator_id = annotator_id.strip()
+            # Progress cached for a different annotator must not carry over
+            if st.session_state.annotator_id != stripped_name:
+                st.session_state.pop("completed_local", None)
+                st.session_state.pop("completed_local_dataset", None)
+            st.session_state.annotator_id = stripped_name
             st.session_state.is_super = (st.session_state.annotator_id.lower() in SUPER_USERS)
             st.session_state.mode = "review" if st.session_state.is_super else "annotate"
 
             # Decide which dataset this user sees
             st.session_state.dataset_key = resolve_dataset_for_user(st.session_state.annotator_id)
 
-            if sheet is not None:
-                from_sheet = get_completed_pairs(sheet, st.session_state.annotator_id)
-                st.session_state.completed_local = set(from_sheet)
-            else:
-                st.session_state.completed_local = set()
+            # Read progress from Google Sheets once per login; afterwards it
+            # is kept up to date locally in session_state.
+            if "completed_local" not in st.session_state:
+                if sheet is not None:
+                    from_sheet = get_completed_pairs(sheet, st.session_state.annotator_id)
+                    st.session_state.completed_seed = set(from_sheet)
+                else:
+                    st.session_state.completed_seed = set()
 
             st.session_state.show_instructions = False
             st.session_state.submitted = False
             st.rerun()
 
 
-def show_super_review_interface(pairs_df):
-    """Super user review-only interface: browse all pairs & see exact filenames."""
-    st.markdown("### Super User Review Mode")
-    st.caption("Browse all pairs and record issues for offline editing of pairs.csv. No explanations required.")
-
-    # Add dataset column for filtering
-    if "dataset" not in pairs_df.columns:
-        pairs_df = pairs_df.copy()
-        pairs_df["dataset"] = pairs_df["A"].apply(infer_dataset_prefix)
-
-    # Init flags list
-    if "super_flags" not in st.session_state:
-        st.session_state.super_flags = []
-    if "super_pos" not in st.session_state:
-        st.session_state.super_pos = 0
-
-    # Sidebar filters + management
-    with st.sidebar:
-        st.markdown("#### Review Controls")
-
-        dataset_filter = st.multiselect(
-            "Dataset filter",
-            options=sorted(pairs_df["dataset"].unique().tolist()),
-            default=sorted(pairs_df["dataset"].unique().tolist()),
-        )
+@st.cache_resource(max_entries=32, show_spinner=False)
+def filter_review_pairs(_pairs_df, pairs_key, datasets, ground_truths, search_text):
+    """
+    Filtered, index-sorted super-review view of the pairs, cached per filter
+    combination so reruns with unchanged filters do no DataFrame work.
 
-        gt_options = sorted(pairs_df["ground_truth"].astype(str).str.lower().unique().tolist())
-        gt_filter = st.multiselect(
-            "Ground truth filter",
-            options=gt_options,
-            default=gt_options,
+    The DataFrame is underscore-prefixed so Streamlit does not hash it;
+    pairs_key (dataset_key, pairs version) identifies it in the cache key.
+    Like load_pairs, the result is shared and must not be mutated.
+    """
+    mask = _pairs_df["dataset"].isin(datasets) & _pairs_df["ground_truth"].isin(ground_truths)
+    if search_text:
+        needle = search_text.lower()
+        mask &= (
+            _pairs_df["A_lower"].str.contains(needle, regex=False, na=False)
+            | _pairs_df["B_lower"].str.contains(needle, regex=False, na=False)
         )
+    return _pairs_df.loc[mask].sort_values("index")
 
-        search_text = st.text_input("Search filename substring (A or B)", value="").strip()
 
-        st.divider()
-        st.markdown("#### Offline Fix List")
-        st.caption("Flag pairs while reviewing; download as CSV for offline edits.")
-        if st.button("Clear flagged list"):
-            st.session_state.super_flags = []
-            st.success("Cleared flagged list.")
+@st.cache_data(max_entries=4, show_spinner=False)
+def flags_table(flags: dict):
+    """Flagged pairs as an index-sorted DataFrame plus its CSV bytes, rebuilt only when the flags change."""
+    flags_df = pd.DataFrame(list(flags.values())).sort_values("index")
+    return flags_df, flags_df.to_csv(index=False).encode("utf-8")
 
-    # Filter view
-    view_df = pairs_df.copy()
-    view_df["ground_truth"] = view_df["ground_truth"].astype(str).str.lower()
-    view_df = view_df[view_df["dataset"].isin(dataset_filter)]
-    view_df = view_df[view_df["ground_truth"].isin(gt_filter)]
 
-    if search_text:
-        mask = (
-            view_df["A"].astype(str).str.contains(search_text, case=False, na=False)
-            | view_df["B"].astype(str).str.contains(search_text, case=False, na=False)
-        )
-        view_df = view_df[mask]
+def nearest_view_position(indices: np.ndarray, jump_index: int) -> int:
+    """
+    Position of jump_index in the sorted indices of the filtered view, or of
+    the nearest index (earlier wins a tie) if it is filtered out.
+    """
+    pos = int(np.searchsorted(indices, jump_index))
+    if pos >= len(indices):
+        return len(indices) - 1
+    if pos > 0 and jump_index - indices[pos - 1] <= indices[pos] - jump_index:
+        return pos - 1
+    return pos
 
-    view_df = view_df.sort_values("index")
 
-    if view_df.empty:
-        st.warning("No pairs match the current filters/search.")
-        return
+@st.fragment
+def show_review_panel(view_df, assets: PairsAssets):
+    """
+    Navigation, metadata, images and flag controls for the filtered view.
 
+    Runs as a fragment, so Previous/Next/Go and the flag buttons rerun only
+    this panel, not the filters or the sidebar.
+    """
     # Clamp position
     max_pos = len(view_df) - 1
     st.session_state.super_pos = min(max(st.session_state.super_pos, 0), max_pos)
@@ -544,27 +1100,19 @@ def show_super_review_interface(pairs_df):
     with nav1:
         if st.button("◀ Previous"):
             st.session_state.super_pos = max(st.session_state.super_pos - 1, 0)
-            st.rerun()
     with nav2:
         if st.button("Next ▶"):
             st.session_state.super_pos = min(st.session_state.super_pos + 1, max_pos)
-            st.rerun()
     with nav3:
         jump_index = st.number_input(
             "Jump to pair index",
-            min_value=int(pairs_df["index"].min()),
-            max_value=int(pairs_df["index"].max()),
+            min_value=assets.min_idx,
+            max_value=assets.max_idx,
             value=int(view_df.iloc[st.session_state.super_pos]["index"]),
             step=1,
         )
         if st.button("Go", key="super_go"):
-            indices = view_df["index"].tolist()
-            if jump_index in indices:
-                st.session_state.super_pos = indices.index(jump_index)
-            else:
-                nearest_pos = min(range(len(indices)), key=lambda i: abs(indices[i] - jump_index))
-                st.session_state.super_pos = nearest_pos
-            st.rerun()
+            st.session_state.super_pos = nearest_view_position(view_df["index"].to_numpy(), jump_index)
     with nav4:
         st.markdown(f"**Showing:** {st.session_state.super_pos + 1} / {len(view_df)} (filtered view)")
 
@@ -593,7 +1141,7 @@ def show_super_review_interface(pairs_df):
         st.markdown("**Face A**")
         img_a = get_image_path(row["A"], split=split)
         try:
-            st.image(img_a, width=340)
+            st.image(image_source(img_a, 340), width=340)
         except Exception:
             st.error(f"Could not load: {img_a}")
         st.caption(str(row["A"]))
@@ -601,7 +1149,7 @@ def show_super_review_interface(pairs_df):
         st.markdown("**Face B**")
         img_b = get_image_path(row["B"], split=split)
         try:
-            st.image(img_b, width=340)
+            st.image(image_source(img_b, 340), width=340)
         except Exception:
             st.error(f"Could not load: {img_b}")
         st.caption(str(row["B"]))
@@ -614,54 +1162,46 @@ def show_super_review_interface(pairs_df):
     b1, b2, b3 = st.columns([1.2, 1.2, 1.2])
     with b1:
         if st.button("Flag: should be SAME"):
-            st.session_state.super_flags.append(
-                {
-                    "index": pair_index,
-                    "A": row["A"],
-                    "B": row["B"],
-                    "current_ground_truth": row["ground_truth"],
-                    "suggested_ground_truth": "same",
-                    "issue_type": "wrong_gt",
-                    "notes": note,
-                }
-            )
+            st.session_state.super_flags[pair_index] = {
+                "index": pair_index,
+                "A": row["A"],
+                "B": row["B"],
+                "current_ground_truth": row["ground_truth"],
+                "suggested_ground_truth": "same",
+                "issue_type": "wrong_gt",
+                "notes": note,
+            }
             st.success("Flagged (suggested SAME).")
     with b2:
         if st.button("Flag: should be DIFFERENT"):
-            st.session_state.super_flags.append(
-                {
-                    "index": pair_index,
-                    "A": row["A"],
-                    "B": row["B"],
-                    "current_ground_truth": row["ground_truth"],
-                    "suggested_ground_truth": "different",
-                    "issue_type": "wrong_gt",
-                    "notes": note,
-                }
-            )
+            st.session_state.super_flags[pair_index] = {
+                "index": pair_index,
+                "A": row["A"],
+                "B": row["B"],
+                "current_ground_truth": row["ground_truth"],
+                "suggested_ground_truth": "different",
+                "issue_type": "wrong_gt",
+                "notes": note,
+            }
             st.success("Flagged (suggested DIFFERENT).")
     with b3:
         if st.button("Flag: broken / unusable"):
-            st.session_state.super_flags.append(
-                {
-                    "index": pair_index,
-                    "A": row["A"],
-                    "B": row["B"],
-                    "current_ground_truth": row["ground_truth"],
-                    "suggested_ground_truth": "",
-                    "issue_type": "broken_unusable",
-                    "notes": note,
-                }
-            )
+            st.session_state.super_flags[pair_index] = {
+                "index": pair_index,
+                "A": row["A"],
+                "B": row["B"],
+                "current_ground_truth": row["ground_truth"],
+                "suggested_ground_truth": "",
+                "issue_type": "broken_unusable",
+                "notes": note,
+            }
             st.success("Flagged (broken/unusable).")
 
     if st.session_state.super_flags:
         st.markdown("#### Flagged list (this session)")
-        flags_df = pd.DataFrame(st.session_state.super_flags)
-        flags_df = flags_df.drop_duplicates(subset=["index"], keep="last").sort_values("index")
+        flags_df, csv_bytes = flags_table(st.session_state.super_flags)
         st.dataframe(flags_df, use_container_width=True)
 
-        csv_bytes = flags_df.to_csv(index=False).encode("utf-8")
         st.download_button(
             label="Download flagged list as CSV",
             data=csv_bytes,
@@ -672,18 +1212,75 @@ def show_super_review_interface(pairs_df):
         st.info("No pairs flagged yet in this session.")
 
 
-def show_annotation_interface(pairs_df, sheet):
-    """Display the main annotation interface (compact layout)."""
+def show_super_review_interface(pairs_df):
+    """Super user review-only interface: browse all pairs & see exact filenames."""
+    st.markdown("### Super User Review Mode")
+    st.caption("Browse all pairs and record issues for offline editing of pairs.csv. No explanations required.")
+
+    # Init flags list
+    # pair index -> flag row; flagging a pair again replaces its earlier flag
+    if "super_flags" not in st.session_state:
+        st.session_state.super_flags = {}
+    if "super_pos" not in st.session_state:
+        st.session_state.super_pos = 0
+
+    # Sidebar filters + management
+    with st.sidebar:
+        st.markdown("#### Review Controls")
+
+        dataset_filter = st.multiselect(
+            "Dataset filter",
+            options=pairs_df["dataset"].cat.categories.tolist(),
+            default=pairs_df["dataset"].cat.categories.tolist(),
+        )
+
+        gt_options = pairs_df["ground_truth"].cat.categories.tolist()
+        gt_filter = st.multiselect(
+            "Ground truth filter",
+            options=gt_options,
+            default=gt_options,
+        )
+
+        search_text = st.text_input("Search filename substring (A or B)", value="").strip()
+
+        st.divider()
+        st.markdown("#### Offline Fix List")
+        st.caption("Flag pairs while reviewing; download as CSV for offline edits.")
+        if st.button("Clear flagged list"):
+            st.session_state.super_flags = {}
+            st.success("Cleared flagged list.")
+
+    # Filter view
+    pairs_key = (st.session_state.get("dataset_key", "ALL"), get_pairs_version())
+    view_df = filter_review_pairs(
+        pairs_df, pairs_key, tuple(sorted(dataset_filter)), tuple(sorted(gt_filter)), search_text
+    )
+
+    if view_df.empty:
+        st.warning("No pairs match the current filters/search.")
+        return
+
+    show_review_panel(view_df, load_pairs_assets(*pairs_key))
+
+
+def show_annotation_interface(get_sheet):
+    """
+    Display the main annotation interface (compact layout).
+
+    get_sheet is only called when something is written, so reruns that merely
+    redraw the page never touch the Google Sheets connection.
+    """
 
     annotator_id = st.session_state.annotator_id
-    ensure_local_progress_initialized(sheet, pairs_df)
+    ensure_local_progress_initialized()
 
-    completed = st.session_state.completed_local
-    all_pairs = pairs_df['index'].tolist()
-    remaining = [i for i in all_pairs if i not in completed]
+    assets = _progress_assets()
+    all_pairs, pairs_index = assets.idx_list, assets.records
+    pending_pos = next_pending_position()
+    current_pair = None if pending_pos is None else all_pairs[pending_pos]
 
     total = len(all_pairs)
-    num_completed = len(completed)
+    num_completed = num_completed_pairs()
     progress = num_completed / total if total > 0 else 0
 
     header_col, progress_col = st.columns([1.2, 2])
@@ -697,16 +1294,21 @@ def show_annotation_interface(pairs_df, sheet):
     with progress_col:
         st.progress(progress)
 
-    if not remaining:
+    # Filled at the end of the sidebar block, after any flush it triggers
+    save_status = st.empty()
+
+    if current_pair is None:
+        if not flush_annotations(get_sheet()):
+            st.error(SAVE_FAILED_MESSAGE)
         st.success("You have completed all annotations! Thank you!")
         if st.button("Start over (re-annotate all pairs)"):
-            st.session_state.completed_local = set()
+            st.session_state.completed_local[:] = False
+            st.session_state.pending_cursor = 0
             st.session_state.submitted = False
             st.rerun()
         return
 
-    current_pair = remaining[0]
-    pair_data = pairs_df[pairs_df['index'] == current_pair].iloc[0]
+    pair_data = pairs_index[current_pair]
     review_mode = st.session_state.get("submitted", False)
 
     with st.sidebar:
@@ -719,80 +1321,95 @@ def show_annotation_interface(pairs_df, sheet):
         st.markdown(f"**Completed:** {num_completed} / {total}")
 
         st.divider()
-        if st.button("Home"):
+        if st.button("Finish session"):
+            if flush_annotations(get_sheet()):
+                st.success("All annotations sent to Google Sheets.")
+
+        if st.button("Home") and flush_annotations(get_sheet()):
             st.session_state.show_instructions = True
             st.rerun()
 
-        if st.button("Switch Annotator"):
+        if st.button("Switch Annotator") and flush_annotations(get_sheet()):
             st.session_state.annotator_id = None
             st.session_state.show_instructions = True
             if "completed_local" in st.session_state:
                 del st.session_state.completed_local
+            st.session_state.pop("completed_local_dataset", None)
+            st.session_state.pop("completed_seed", None)
             if "dataset_key" in st.session_state:
                 del st.session_state.dataset_key
+            clear_pair_inputs()
             st.session_state.submitted = False
             st.rerun()
 
+    if get_pending_writes().failed_count():
+        save_status.error(SAVE_FAILED_MESSAGE)
+
     st.markdown("#### 1. Compare these faces")
 
     outer_left, outer_center, outer_right = st.columns([0.1, 0.8, 0.1])
     with outer_center:
         img_col1, img_col2 = st.columns(2)
-        split = pair_data.get("split", "A")
+        split = pair_data.split
 
         with img_col1:
             st.markdown("**Face A**")
-            image_a_path = get_image_path(pair_data['A'], split=split)
+            image_a_path = get_image_path(pair_data.A, split=split)
             try:
-                st.image(image_a_path, width=320)
+                st.image(image_source(image_a_path, PAIR_IMAGE_WIDTH), width=PAIR_IMAGE_WIDTH)
             except Exception:
                 st.error(f"Could not load image: {image_a_path}")
 
         with img_col2:
             st.markdown("**Face B**")
-            image_b_path = get_image_path(pair_data['B'], split=split)
+            image_b_path = get_image_path(pair_data.B, split=split)
             try:
-                st.image(image_b_path, width=320)
+                st.image(image_source(image_b_path, PAIR_IMAGE_WIDTH), width=PAIR_IMAGE_WIDTH)
             except Exception:
                 st.error(f"Could not load image: {image_b_path}")
 
+    prefetch_upcoming_pairs(st.session_state.completed_local, pending_pos, pairs_index, all_pairs)
+
     st.markdown("---")
 
     st.markdown("#### 2. Your decision and explanation")
-    decision_col, expl_col = st.columns([1, 2])
-
-    with decision_col:
-        decision = st.radio(
-            "Are these the same person?",
-            options=["same", "different"],
-            index=None,
-            horizontal=False,
-            key=f"decision_{current_pair}",
-        )
 
-    if decision == "same":
-        expl_placeholder = (
-            "Describe the facial features that indicate these are the same person "
-            "(e.g., nose shape, eye spacing, jawline, distinctive marks)..."
-        )
-    elif decision == "different":
-        expl_placeholder = (
-            "Describe the facial features that indicate these are different people "
-            "(e.g., different nose shape, face structure, distinguishing features)..."
-        )
-    else:
-        expl_placeholder = "First choose whether they are the same or different person on the left."
-
-    with expl_col:
-        initial_explanation = st.text_area(
-            f"Explanation (minimum {MIN_EXPLANATION_LENGTH} characters):",
-            placeholder=expl_placeholder,
-            key=f"explanation_{current_pair}",
-            disabled=(decision is None),
-            height=110,
+    # Widgets inside a form do not rerun the script while the annotator picks a
+    # decision or types; the whole page reruns once, when the form is submitted.
+    with st.form("annotate_form"):
+        decision_col, expl_col = st.columns([1, 2])
+
+        with decision_col:
+            decision = st.radio(
+                "Are these the same person?",
+                options=["same", "different"],
+                index=None,
+                horizontal=False,
+                key="decision",
+                disabled=review_mode,
+            )
+
+        with expl_col:
+            initial_explanation = st.text_area(
+                f"Explanation (minimum {MIN_EXPLANATION_LENGTH} characters):",
+                placeholder=(
+                    "Describe the facial features that indicate these are the same person "
+                    "or different people (e.g., nose shape, eye spacing, jawline, "
+                    "distinctive marks)..."
+                ),
+                key="explanation",
+                disabled=review_mode,
+                height=110,
+            )
+
+        if not review_mode:
+            st.markdown("#### 3. Submit")
+        submit_clicked = st.form_submit_button(
+            "Submit Answer", type="primary", disabled=review_mode
         )
 
-    explanation_valid = len(initial_explanation.strip()) >= MIN_EXPLANATION_LENGTH
+    explanation_len = len(initial_explanation.strip())
+    explanation_valid = explanation_len >= MIN_EXPLANATION_LENGTH
 
     feedback_col, _ = st.columns([2, 1])
     with feedback_col:
@@ -800,69 +1417,50 @@ def show_annotation_interface(pairs_df, sheet):
             if not explanation_valid:
                 st.markdown(
                     f"<span class='small-caption' style='color:#cc6600;'>"
-                    f"Explanation length: {len(initial_explanation.strip())} / {MIN_EXPLANATION_LENGTH}</span>",
+                    f"Explanation length: {explanation_len} / {MIN_EXPLANATION_LENGTH}</span>",
                     unsafe_allow_html=True,
                 )
             else:
                 st.markdown(
                     f"<span class='small-caption' style='color:#228B22;'>"
-                    f"Explanation length OK: {len(initial_explanation.strip())} characters</span>",
+                    f"Explanation length OK: {explanation_len} characters</span>",
                     unsafe_allow_html=True,
                 )
 
     st.markdown("---")
 
-    if not review_mode:
-        st.markdown("#### 3. Submit")
-        if st.button("Submit Answer", type="primary", key=f"submit_{current_pair}"):
-            if decision is None:
-                st.error("Please select whether these are the same person or different people before submitting.")
-            elif not explanation_valid:
-                st.error(
-                    f"Your explanation must be at least {MIN_EXPLANATION_LENGTH} characters "
-                    f"({len(initial_explanation.strip())}/{MIN_EXPLANATION_LENGTH})."
-                )
-            else:
-                ground_truth = str(pair_data['ground_truth']).lower()
-                is_correct = (decision == ground_truth)
-
-                if is_correct:
-                    annotation = {
-                        "timestamp": datetime.now().isoformat(),
-                        "annotator_id": annotator_id,
-                        "pair_index": int(pair_data['index']),
-                        "image_a": pair_data['A'],
-                        "image_b": pair_data['B'],
-                        "ground_truth": ground_truth,
-                        "celeb_id": str(pair_data.get('celeb_id', "")),
-                        "human_decision": decision,
-                        "initial_explanation": initial_explanation,
-                        "is_correct": True,
-                        "followup_explanation": "",
-                    }
-                    if save_annotation(sheet, annotation):
-                        st.session_state.completed_local.add(int(pair_data['index']))
-                        st.session_state.submitted = False
-                        st.rerun()
-                else:
-                    st.session_state.submitted = True
-                    st.session_state.is_correct = False
-                    st.session_state.ground_truth = ground_truth
-                    st.session_state.decision = decision
-                    st.session_state.initial_explanation = initial_explanation
-                    st.session_state.pair_data = pair_data
+    # review_mode guards against a second click on the (not yet disabled) form
+    # in the run where an incorrect answer was just revealed below
+    if submit_clicked and not review_mode:
+        if decision is None:
+            st.error("Please select whether these are the same person or different people before submitting.")
+        elif not explanation_valid:
+            st.error(
+                f"Your explanation must be at least {MIN_EXPLANATION_LENGTH} characters "
+                f"({explanation_len}/{MIN_EXPLANATION_LENGTH})."
+            )
+        else:
+            if decision == pair_data.ground_truth:
+                annotation = build_annotation(annotator_id, pair_data, decision, initial_explanation)
+                if save_annotation(get_sheet(), annotation):
+                    mark_completed(pair_data.index)
+                    clear_pair_inputs()
+                    st.session_state.submitted = False
                     st.rerun()
+            else:
+                # The review block below renders in this same run
+                # Stored under keys of their own: "decision"/"explanation" are
+                # widget keys and cannot be written once the widgets are drawn
+                st.session_state.submitted = True
+                st.session_state.submitted_decision = decision
+                st.session_state.submitted_explanation = initial_explanation
+                st.session_state.pair_index = pair_data.index
 
     if st.session_state.get("submitted", False):
-        is_correct = st.session_state.is_correct
-        ground_truth = st.session_state.ground_truth
-        decision = st.session_state.decision
-        initial_explanation = st.session_state.initial_explanation
-        pair_state = st.session_state.pair_data
-
-        if is_correct:
-            st.session_state.submitted = False
-            st.rerun()
+        decision = st.session_state.submitted_decision
+        initial_explanation = st.session_state.submitted_explanation
+        pair_state = pairs_index[st.session_state.pair_index]
+        ground_truth = pair_state.ground_truth
 
         st.markdown("#### 3. Review (your answer was incorrect)")
         st.markdown(
@@ -874,54 +1472,48 @@ def show_annotation_interface(pairs_df, sheet):
             f"to describe why these images may be **{ground_truth.upper()}**?"
         )
 
-        followup_explanation = st.text_area(
-            f"Reflection (minimum {MIN_EXPLANATION_LENGTH} characters):",
-            placeholder=(
-                "Describe what features you might have missed or misinterpreted. "
-                "What would you look for differently next time?"
-            ),
-            key=f"followup_reflect_{current_pair}",
-            height=110,
-        )
+        with st.form("reflect_form"):
+            followup_explanation = st.text_area(
+                f"Reflection (minimum {MIN_EXPLANATION_LENGTH} characters):",
+                placeholder=(
+                    "Describe what features you might have missed or misinterpreted. "
+                    "What would you look for differently next time?"
+                ),
+                key="followup_reflect",
+                height=110,
+            )
+            next_clicked = st.form_submit_button("Next Pair", type="primary")
 
-        followup_valid = len(followup_explanation.strip()) >= MIN_EXPLANATION_LENGTH
+        followup_len = len(followup_explanation.strip())
+        followup_valid = followup_len >= MIN_EXPLANATION_LENGTH
 
         if followup_explanation:
             if not followup_valid:
                 st.markdown(
                     f"<span class='small-caption' style='color:#cc6600;'>"
-                    f"Reflection length: {len(followup_explanation.strip())} / {MIN_EXPLANATION_LENGTH}</span>",
+                    f"Reflection length: {followup_len} / {MIN_EXPLANATION_LENGTH}</span>",
                     unsafe_allow_html=True,
                 )
             else:
                 st.markdown(
                     f"<span class='small-caption' style='color:#228B22;'>"
-                    f"Reflection length OK: {len(followup_explanation.strip())} characters</span>",
+                    f"Reflection length OK: {followup_len} characters</span>",
                     unsafe_allow_html=True,
                 )
 
-        if st.button("Next Pair", type="primary", key=f"next_incorrect_{current_pair}"):
+        if next_clicked:
             if not followup_valid:
                 st.error(
                     f"Your reflection must be at least {MIN_EXPLANATION_LENGTH} characters "
-                    f"({len(followup_explanation.strip())}/{MIN_EXPLANATION_LENGTH})."
+                    f"({followup_len}/{MIN_EXPLANATION_LENGTH})."
                 )
             else:
-                annotation = {
-                    "timestamp": datetime.now().isoformat(),
-                    "annotator_id": annotator_id,
-                    "pair_index": int(pair_state['index']),
-                    "image_a": pair_state['A'],
-                    "image_b": pair_state['B'],
-                    "ground_truth": ground_truth,
-                    "celeb_id": str(pair_state.get('celeb_id', "")),
-                    "human_decision": decision,
-                    "initial_explanation": initial_explanation,
-                    "is_correct": False,
-                    "followup_explanation": followup_explanation,
-                }
-                if save_annotation(sheet, annotation):
-                    st.session_state.completed_local.add(int(pair_state['index']))
+                annotation = build_annotation(
+                    annotator_id, pair_state, decision, initial_explanation, followup_explanation
+                )
+                if save_annotation(get_sheet(), annotation):
+                    mark_completed(pair_state.index)
+                    clear_pair_inputs()
                     st.session_state.submitted = False
                     st.rerun()
 
@@ -978,24 +1570,22 @@ def main():
 
     # Load data (dataset depends on annotator)
     dataset_key = st.session_state.get("dataset_key", "ALL")
-    pairs_df = load_pairs(dataset_key)
+    pairs_df = load_pairs(dataset_key, get_pairs_version())
     if pairs_df is None:
         st.error("Could not load pairs data. Please check your samplea/sampleb CSV files.")
         return
 
-    # Connect to Google Sheets
-    sheet = get_google_sheet()
-    if sheet is None:
-        st.warning("Running without Google Sheets. Annotations will not be saved.")
+    # Google Sheets is connected lazily, only by the code paths that need it
+    get_sheet = get_google_sheet
 
     # Route pages
     if st.session_state.show_instructions:
-        show_instructions(pairs_df, sheet)
+        show_instructions(pairs_df, get_sheet)
         return
 
     if st.session_state.annotator_id is None:
         st.session_state.show_instructions = True
-        st.rerun()
+        show_instructions(pairs_df, get_sheet)
         return
 
     # If user got here without dataset_key set (rare), set it now
@@ -1017,7 +1607,7 @@ def main():
     if st.session_state.is_super and st.session_state.mode == "review":
         show_super_review_interface(pairs_df)
     else:
-        show_annotation_interface(pairs_df, sheet)
+        show_annotation_interface(get_sheet)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import gspread
+import pytest
+import streamlit as st
+from google.oauth2.service_account import Credentials
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+
+@pytest.fixture
+def app_path():
+    return str(REPO_ROOT / "app.py")
+
+
+class FakeSheet:
+    """In-memory stand-in for the gspread worksheet the app writes to."""
+
+    def __init__(self):
+        self.rows = []
+        self.fail_appends = False
+
+    def row_values(self, row):
+        return self.rows[row - 1] if len(self.rows) >= row else []
+
+    def update(self, range_name=None, values=None, **kwargs):
+        self.rows[:1] = values
+
+    def append_rows(self, rows, **kwargs):
+        if self.fail_appends:
+            raise ConnectionError("Sheets unavailable")
+        self.rows.extend(rows)
+
+    def get(self, range_name=None, major_dimension=None, **kwargs):
+        data = self.rows[1:]
+        return [[r[1] for r in data], [str(r[2]) for r in data]]
+
+
+@pytest.fixture
+def fake_sheet(monkeypatch):
+    sheet = FakeSheet()
+    client = SimpleNamespace(open_by_key=lambda key: SimpleNamespace(sheet1=sheet))
+    monkeypatch.setattr(gspread, "authorize", lambda creds: client)
+    monkeypatch.setattr(Credentials, "from_service_account_info", lambda info, scopes=None: object())
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    yield sheet
+    st.cache_resource.clear()
+    st.cache_data.clear()
@@ -0,0 +1,73 @@
+import time
+
+from streamlit.testing.v1 import AppTest
+
+EXPLANATION = "The nose bridge and the jawline look clearly different here."
+
+
+def wait_for_rows(sheet, count, timeout=10):
+    deadline = time.monotonic() + timeout
+    while len(sheet.rows) < count and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return sheet.rows
+
+
+def click(at, label):
+    next(b for b in at.button if b.label == label).click()
+    return at.run()
+
+
+def start_session(app_path, annotator_id="annotator1"):
+    at = AppTest.from_file(app_path, default_timeout=30)
+    at.secrets["gcp_service_account"] = {"type": "service_account"}
+    at.run()
+    at.text_input(key="annotator_input").input(annotator_id)
+    return click(at, "I understand, continue")
+
+
+def test_wrong_answer_reflection_then_next_pair(app_path, fake_sheet):
+    at = start_session(app_path)
+    assert not at.exception
+    assert any("**Current Pair:** `0`" in m.value for m in at.sidebar.markdown)
+
+    # Pair 0 of dataset A is "different", so "same" takes the review path
+    at.radio(key="decision").set_value("same")
+    at.text_area(key="explanation").input(EXPLANATION)
+    at = click(at, "Submit Answer")
+    assert not at.exception
+    assert any("Review (your answer was incorrect)" in m.value for m in at.markdown)
+
+    at.text_area(key="followup_reflect").input(EXPLANATION)
+    at = click(at, "Next Pair")
+    assert not at.exception
+    assert any("**Current Pair:** `1`" in m.value for m in at.sidebar.markdown)
+
+    rows = wait_for_rows(fake_sheet, 2)
+    header, row = rows[0], dict(zip(rows[0], rows[1]))
+    assert header[0] == "timestamp"
+    assert row["pair_index"] == 0
+    assert row["human_decision"] == "same"
+    assert row["is_correct"] is False
+    assert row["initial_explanation"] == EXPLANATION
+    assert row["followup_explanation"] == EXPLANATION
+
+
+def test_failed_write_is_reported_and_sent_again(app_path, fake_sheet):
+    at = start_session(app_path)
+    fake_sheet.fail_appends = True
+
+    # Pair 0 of dataset A is "different": a correct answer is saved right away
+    at.radio(key="decision").set_value("different")
+    at.text_area(key="explanation").input(EXPLANATION)
+    at = click(at, "Submit Answer")
+    at = click(at, "Finish session")
+    assert not at.exception
+    assert not any("All annotations sent" in m.value for m in at.sidebar.success)
+    assert any("could not be saved" in e.value for e in at.error)
+    assert len(fake_sheet.rows) == 1  # header only: the row was not written
+
+    fake_sheet.fail_appends = False
+    at = click(at, "Finish session")
+    assert any("All annotations sent" in m.value for m in at.sidebar.success)
+    assert not at.error
+    assert [row[2] for row in fake_sheet.rows[1:]] == [0]
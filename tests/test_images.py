@@ -0,0 +1,65 @@
+import io
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def clear_thumbs():
+    app.load_thumb.clear()
+    yield
+    app.load_thumb.clear()
+
+
+def write_image(path, size, fmt):
+    Image.new("RGB", size, (120, 80, 40)).save(path, format=fmt)
+    return str(path)
+
+
+@pytest.mark.parametrize("fmt, suffix", [("JPEG", "jpg"), ("PNG", "png")])
+def test_small_images_are_sent_unchanged(tmp_path, fmt, suffix):
+    path = write_image(tmp_path / f"small.{suffix}", (250, 300), fmt)
+    with open(path, "rb") as f:
+        assert app.load_thumb(path, 320) == f.read()
+
+
+def test_large_images_are_downscaled(tmp_path):
+    path = write_image(tmp_path / "large.png", (1440, 960), "PNG")
+    with Image.open(io.BytesIO(app.load_thumb(path, 320))) as im:
+        assert im.format == "JPEG"
+        assert im.size == (320, 213)
+
+
+def test_small_images_in_other_formats_are_re_encoded(tmp_path):
+    path = write_image(tmp_path / "small.bmp", (100, 100), "BMP")
+    with Image.open(io.BytesIO(app.load_thumb(path, 320))) as im:
+        assert im.format == "JPEG"
+        assert im.size == (100, 100)
+
+
+class SessionState(dict):
+    __getattr__ = dict.__getitem__
+    __setattr__ = dict.__setitem__
+
+
+def test_prefetch_takes_the_next_pending_pairs(monkeypatch):
+    submitted = []
+    pool = SimpleNamespace(submit=lambda fn, path, w: submitted.append(path))
+    monkeypatch.setattr(app, "get_prefetch_pool", lambda: pool)
+    monkeypatch.setattr(app, "USE_IMAGE_URLS", False)
+    monkeypatch.setattr(app.st, "session_state", SessionState())
+    completed = np.array([True, False, True, False, False, False, False])
+    all_pairs = [10, 11, 12, 13, 14, 15, 16]
+    records = {i: SimpleNamespace(A=f"a{i}.jpg", B=f"b{i}.jpg", split="A") for i in all_pairs}
+
+    app.prefetch_upcoming_pairs(completed, 1, records, all_pairs)
+    assert app.st.session_state.prefetched_pairs == [13, 14, 15]
+    assert [Path(p).name for p in submitted] == ["a13.jpg", "b13.jpg", "a14.jpg", "b14.jpg", "a15.jpg", "b15.jpg"]
+
+    app.prefetch_upcoming_pairs(completed, 5, records, all_pairs)
+    assert app.st.session_state.prefetched_pairs == [16]
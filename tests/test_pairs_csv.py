@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+import app
+
+CSV = """index,A,B,ground_truth,celeb_id
+0,celeba_001.jpg,celeba_002.jpg,Same,c001
+1,lfw_003.jpg,lfw_004.jpg,different,
+2,casia_005.jpg,casia_006.jpg,,c005_c006
+"""
+
+
+@pytest.fixture
+def pairs_csv(tmp_path, monkeypatch):
+    path = tmp_path / "pairs.csv"
+    path.write_text(CSV)
+    monkeypatch.setattr(app, "DATASET_A_CSV", path)
+    app.load_pairs.clear()
+    app.load_pairs_assets.clear()
+    yield path
+    app.load_pairs.clear()
+    app.load_pairs_assets.clear()
+
+
+def test_blank_celeb_id_loads_as_empty_string(pairs_csv):
+    df = app._read_pairs_csv(pairs_csv, "A")
+    assert df["celeb_id"].tolist() == ["c001", "", "c005_c006"]
+    assert df["ground_truth"].iloc[0] == "same"
+
+
+def test_blank_celeb_id_row_is_json_serialisable(pairs_csv):
+    assets = app.load_pairs_assets("A", ("test",))
+    pair = assets.records[1]
+    assert pair.celeb_id == ""
+    annotation = app.build_annotation("annotator1", pair, "different", "explanation")
+    row = app.annotation_to_row({**annotation, "_enqueue_ns": 1_700_000_000 * 10**9})
+    json.dumps(row, allow_nan=False)
+
+
+def test_pairs_without_ground_truth_are_skipped(pairs_csv):
+    df = app.load_pairs("A", ("test",))
+    assert df["index"].tolist() == [0, 1]
+
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+
+INDICES = np.array([2, 5, 9, 14])
+
+
+def linear_nearest(indices, jump_index):
+    """The pre-searchsorted lookup: exact hit, else the nearest (first wins a tie)."""
+    indices = list(indices)
+    if jump_index in indices:
+        return indices.index(jump_index)
+    return min(range(len(indices)), key=lambda i: abs(indices[i] - jump_index))
+
+
+@pytest.mark.parametrize("jump_index, expected", [
+    (2, 0),    # first pair
+    (9, 2),    # existing index
+    (14, 3),   # last pair
+    (0, 0),    # before the start
+    (6, 1),    # missing: nearest is 5
+    (8, 2),    # missing: nearest is 9
+    (7, 1),    # missing, tie between 5 and 9: the earlier wins
+    (99, 3),   # past the end of the list
+])
+def test_jump_lands_on_the_pair_or_its_nearest_neighbour(jump_index, expected):
+    assert app.nearest_view_position(INDICES, jump_index) == expected
+
+
+def test_jump_matches_the_linear_lookup():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        indices = np.sort(rng.choice(500, size=rng.integers(1, 40), replace=False))
+        jump_index = int(rng.integers(-10, 510))
+        assert app.nearest_view_position(indices, jump_index) == linear_nearest(indices, jump_index)
+
+
+def test_dataset_prefixes():
+    filenames = pd.Series([
+        "celeba_001.jpg",
+        "lfw_Aaron_Eckhart_0001.jpg",
+        "casia_0000045_001.jpg",
+        "vggface2_n000002.jpg",
+        "ffhq_00001.png",   # unknown prefix
+        "noprefix.jpg",     # no underscore at all
+        np.nan,             # missing filename
+        None,
+    ])
+    assert app.infer_dataset_prefixes(filenames).tolist() == [
+        "celeba", "lfw", "casia", "vggface2", "other", "other", "unknown", "unknown",
+    ]
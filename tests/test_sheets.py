@@ -0,0 +1,153 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import gspread
+import pytest
+
+import app
+from conftest import FakeSheet
+
+
+@pytest.fixture
+def connect(monkeypatch, fake_sheet):
+    """Make gspread.authorize hand out fake_sheet, or raise while .fail is set."""
+    state = SimpleNamespace(fail=False, sheet=fake_sheet)
+
+    def authorize(creds):
+        if state.fail:
+            raise ConnectionError("Sheets unavailable")
+        return SimpleNamespace(open_by_key=lambda key: SimpleNamespace(sheet1=state.sheet))
+
+    monkeypatch.setattr(app, "_load_credentials", lambda: object())
+    monkeypatch.setattr(gspread, "authorize", authorize)
+    return state
+
+
+def api_error(status, headers=None, details=None):
+    error = {"code": status, "message": "denied", "status": ""}
+    if details is not None:
+        error["details"] = details
+    response = SimpleNamespace(
+        status_code=status,
+        text="",
+        headers=headers or {},
+        json=lambda: {"error": error},
+    )
+    return gspread.exceptions.APIError(response)
+
+
+def test_failed_connection_is_not_cached(connect):
+    connect.fail = True
+    assert app.get_google_sheet() is None
+    connect.fail = False
+    assert app.get_google_sheet() is connect.sheet
+
+
+def test_failed_reconnect_keeps_the_cached_sheet(connect, caplog):
+    sheet = app.get_google_sheet()
+    connect.fail = True
+    assert app.reconnect_google_sheet() is None
+    assert app.get_google_sheet() is sheet
+    [record] = [r for r in caplog.records if r.name == app.logger.name]
+    assert record.message == "Could not reconnect to Google Sheets"
+    assert record.exc_info[0] is ConnectionError
+
+
+def test_reconnect_replaces_the_cached_sheet(connect):
+    app.get_google_sheet()
+    connect.sheet = FakeSheet()
+    assert app.reconnect_google_sheet() is connect.sheet
+    assert app.get_google_sheet() is connect.sheet
+
+
+def test_only_rejected_credentials_trigger_a_reconnect():
+    assert app._is_auth_error(api_error(401))
+    assert not app._is_auth_error(api_error(403))
+    assert app._is_auth_error(app.RefreshError("invalid_grant"))
+
+
+@pytest.fixture
+def new_york_time(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_timestamps_use_the_local_zone_at_submit_time(new_york_time):
+    summer = app.annotation_to_row({"_enqueue_ns": 1_690_000_000 * 10**9})[0]
+    winter = app.annotation_to_row({"_enqueue_ns": 1_700_000_000 * 10**9})[0]
+    assert summer == "2023-07-22T00:26:40"  # EDT, UTC-4
+    assert winter == "2023-11-14T17:13:20"  # EST, UTC-5
+
+
+def test_flush_ends_the_writer_linger(monkeypatch):
+    monkeypatch.setattr(app, "WRITE_LINGER_SECONDS", 30)
+    sheet, q, writes = FakeSheet(), app.queue.Queue(), app.PendingWrites()
+    threading.Thread(target=app._writer_loop, args=(sheet, q), daemon=True).start()
+    writes.sent()
+    q.put(({"_enqueue_ns": time.time_ns()}, writes))
+    q.put(app.FLUSH)
+    started = time.monotonic()
+    writes.wait()
+    assert time.monotonic() - started < 5
+    assert len(sheet.rows) == 1 and writes.failed_count() == 0
+
+
+@pytest.mark.parametrize("error, attempt, expected", [
+    (api_error(429, headers={"Retry-After": "7"}), 0, 7.0),
+    (api_error(429, headers={"Retry-After": "7"}, details=[{"retryDelay": "3s"}]), 0, 7.0),
+    (api_error(429, details=[{"@type": "ErrorInfo"}, {"retryDelay": "3s"}]), 0, 3.0),
+    (api_error(429, headers={"Retry-After": "soon"}), 0, None),
+])
+def test_retry_delay_prefers_the_server_hint(error, attempt, expected):
+    delay = app._retry_delay(error, attempt)
+    if expected is None:  # unparseable hint: exponential fallback
+        assert 1 <= delay < 2
+    else:
+        assert delay == expected
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 3])
+def test_retry_delay_falls_back_to_exponential_backoff(attempt):
+    delay = app._retry_delay(api_error(429), attempt)
+    assert 2 ** attempt <= delay < 2 ** attempt + 1
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(app.time, "sleep", slept.append)
+    return slept
+
+
+def flaky(*errors, result="ok"):
+    """A callable that raises the given errors in turn, then returns result."""
+    pending = list(errors)
+
+    def fn():
+        if pending:
+            raise pending.pop(0)
+        return result
+    return fn
+
+
+def test_with_backoff_retries_rate_limits(sleeps):
+    fn = flaky(api_error(429, headers={"Retry-After": "1"}), api_error(429, headers={"Retry-After": "2"}))
+    assert app._with_backoff(fn) == "ok"
+    assert sleeps == [1.0, 2.0]
+
+
+def test_with_backoff_raises_other_errors_at_once(sleeps):
+    with pytest.raises(gspread.exceptions.APIError):
+        app._with_backoff(flaky(api_error(500)))
+    assert sleeps == []
+
+
+def test_with_backoff_gives_up_after_max_tries(sleeps):
+    fn = flaky(*[api_error(429, headers={"Retry-After": "1"}) for _ in range(3)])
+    with pytest.raises(gspread.exceptions.APIError):
+        app._with_backoff(fn, max_tries=3)
+    assert sleeps == [1.0, 1.0]